@@ -3,6 +3,7 @@
 import os
 import errno
 import stat
+import types
 import unittest
 
 from pathlib._abc import UnsupportedOperation, ParserBase, PurePathBase, PathBase
@@ -12,24 +13,19 @@
 from test.support.os_helper import TESTFN
 
 
-_tests_needing_posix = set()
-_tests_needing_windows = set()
-_tests_needing_symlinks = set()
-
-
 def needs_posix(fn):
     """Decorator that marks a test as requiring a POSIX-flavoured path class."""
-    _tests_needing_posix.add(fn.__name__)
+    fn.needs_posix = True
     return fn
 
 def needs_windows(fn):
     """Decorator that marks a test as requiring a Windows-flavoured path class."""
-    _tests_needing_windows.add(fn.__name__)
+    fn.needs_windows = True
     return fn
 
 def needs_symlinks(fn):
     """Decorator that marks a test as requiring a path class that supports symlinks."""
-    _tests_needing_symlinks.add(fn.__name__)
+    fn.needs_symlinks = True
     return fn
 
 
@@ -138,10 +134,10 @@ class DummyPurePathTest(unittest.TestCase):
     base = f'/this/path/kills/fascists/{TESTFN}'
 
     def setUp(self):
-        name = self.id().split('.')[-1]
-        if name in _tests_needing_posix and self.cls.parser is not posixpath:
+        test_method = getattr(self, self._testMethodName)
+        if getattr(test_method, 'needs_posix', False) and self.cls.parser is not posixpath:
             self.skipTest('requires POSIX-flavoured path class')
-        if name in _tests_needing_windows and self.cls.parser is posixpath:
+        if getattr(test_method, 'needs_windows', False) and self.cls.parser is posixpath:
             self.skipTest('requires Windows-flavoured path class')
         p = self.cls('a')
         self.parser = p.parser
@@ -1409,16 +1405,46 @@ class DummyPathIO(io.BytesIO):
     Used by DummyPath to implement `open('w')`
     """
 
-    def __init__(self, files, path):
+    def __init__(self, node):
         super().__init__()
-        self.files = files
-        self.path = path
+        self.node = node
 
     def close(self):
-        self.files[self.path] = self.getvalue()
+        self.node.data = self.getvalue()
         super().close()
 
 
+class DummyPathNode:
+    """
+    Node in the tree of files and directories kept in memory by DummyPath.
+    Directories have a dict of child nodes, files have their data as bytes,
+    and symlinks have their target path as a string.
+    """
+    __slots__ = ('st_mode', 'children', 'data', 'target')
+
+    def __init__(self, children=None, data=None, target=None):
+        if children is not None:
+            self.st_mode = stat.S_IFDIR
+        elif data is not None:
+            self.st_mode = stat.S_IFREG
+        else:
+            self.st_mode = stat.S_IFLNK
+        self.children = children
+        self.data = data
+        self.target = target
+
+    def freeze(self):
+        """
+        Make the children of this directory and of all its subdirectories
+        read-only, so that the tree can be shared. DummyPath copies frozen
+        directories before changing them.
+        """
+        for child in self.children.values():
+            if child.children is not None:
+                child.freeze()
+        self.children = types.MappingProxyType(self.children)
+
+
 DummyPathStatResult = collections.namedtuple(
     'DummyPathStatResult',
     'st_mode st_ino st_dev st_nlink st_uid st_gid st_size st_atime st_mtime st_ctime')
@@ -1432,9 +1458,7 @@ class DummyPath(PathBase):
     __slots__ = ()
     parser = posixpath
 
-    _files = {}
-    _directories = {}
-    _symlinks = {}
+    _root = DummyPathNode(children={})
 
     def __eq__(self, other):
         if not isinstance(other, DummyPath):
@@ -1447,44 +1471,59 @@ def __hash__(self):
     def __repr__(self):
         return "{}({!r})".format(self.__class__.__name__, self.as_posix())
 
+    def _get_node(self, path, mutable=False):
+        """Return the node at the given path string, or None. If *mutable* is
+        true, frozen directories along the way are copied so that their
+        children can be changed."""
+        node = self._root
+        if mutable and not isinstance(node.children, dict):
+            node.children = dict(node.children)
+        for name in path.split(self.parser.sep):
+            if not name:
+                continue
+            if node.children is None:
+                return None
+            child = node.children.get(name)
+            if child is None:
+                return None
+            if mutable and child.children is not None and not isinstance(child.children, dict):
+                child = DummyPathNode(children=dict(child.children))
+                node.children[name] = child
+            node = child
+        return node
+
     def stat(self, *, follow_symlinks=True):
         if follow_symlinks or self.name in ('', '.', '..'):
             path = str(self.resolve(strict=True))
         else:
-            path = str(self.parent.resolve(strict=True) / self.name)
-        if path in self._files:
-            st_mode = stat.S_IFREG
-        elif path in self._directories:
-            st_mode = stat.S_IFDIR
-        elif path in self._symlinks:
-            st_mode = stat.S_IFLNK
-        else:
+            path = self.parser.join(str(self.parent.resolve(strict=True)), self.name)
+        node = self._get_node(path)
+        if node is None:
             raise FileNotFoundError(errno.ENOENT, "Not found", str(self))
-        return DummyPathStatResult(st_mode, hash(str(self)), 0, 0, 0, 0, 0, 0, 0, 0)
+        return DummyPathStatResult(node.st_mode, hash(str(self)), 0, 0, 0, 0, 0, 0, 0, 0)
 
     def open(self, mode='r', buffering=-1, encoding=None,
              errors=None, newline=None):
         if buffering != -1:
             raise NotImplementedError
-        path_obj = self.resolve()
-        path = str(path_obj)
-        name = path_obj.name
-        parent = str(path_obj.parent)
-        if path in self._directories:
+        path = str(self.resolve())
+        parent, name = self.parser.split(path)
+        node = self._get_node(path)
+        if node is not None and node.children is not None:
             raise IsADirectoryError(errno.EISDIR, "Is a directory", path)
 
         text = 'b' not in mode
         mode = ''.join(c for c in mode if c not in 'btU')
         if mode == 'r':
-            if path not in self._files:
+            if node is None or node.data is None:
                 raise FileNotFoundError(errno.ENOENT, "File not found", path)
-            stream = io.BytesIO(self._files[path])
+            stream = io.BytesIO(node.data)
         elif mode == 'w':
-            if parent not in self._directories:
+            parent_node = self._get_node(parent, mutable=True)
+            if parent_node is None or parent_node.children is None:
                 raise FileNotFoundError(errno.ENOENT, "File not found", parent)
-            stream = DummyPathIO(self._files, path)
-            self._files[path] = b''
-            self._directories[parent].add(name)
+            node = parent_node.children[name] = DummyPathNode(data=b'')
+            stream = DummyPathIO(node)
         else:
             raise NotImplementedError
         if text:
@@ -1493,60 +1532,65 @@ def open(self, mode='r', buffering=-1, encoding=None,
 
     def iterdir(self):
         path = str(self.resolve())
-        if path in self._files:
+        node = self._get_node(path)
+        if node is not None and node.data is not None:
             raise NotADirectoryError(errno.ENOTDIR, "Not a directory", path)
-        elif path in self._directories:
-            return iter([self / name for name in self._directories[path]])
+        elif node is not None and node.children is not None:
+            # Join child names onto our path string up front, rather than
+            # calling parser.join() for every child.
+            prefix = str(self)
+            if prefix and not prefix.endswith(self.parser.sep):
+                prefix += self.parser.sep
+            names = tuple(node.children)
+            return (self.with_segments(prefix + name) for name in names)
         else:
             raise FileNotFoundError(errno.ENOENT, "File not found", path)
 
     def mkdir(self, mode=0o777, parents=False, exist_ok=False):
         path = str(self.resolve())
-        if path in self._directories:
-            if exist_ok:
+        node = self._get_node(path)
+        if node is not None:
+            if exist_ok and node.children is not None:
                 return
             else:
                 raise FileExistsError(errno.EEXIST, "File exists", path)
-        try:
-            if self.name:
-                self._directories[str(self.parent)].add(self.name)
-            self._directories[path] = set()
-        except KeyError:
+        parent, name = self.parser.split(path)
+        parent_node = self._get_node(parent, mutable=True)
+        if parent_node is None or parent_node.children is None:
             if not parents:
-                raise FileNotFoundError(errno.ENOENT, "File not found", str(self.parent)) from None
+                raise FileNotFoundError(errno.ENOENT, "File not found", str(self.parent))
             self.parent.mkdir(parents=True, exist_ok=True)
             self.mkdir(mode, parents=False, exist_ok=exist_ok)
+        else:
+            parent_node.children[name] = DummyPathNode(children={})
 
     def unlink(self, missing_ok=False):
-        path_obj = self.parent.resolve(strict=True) / self.name
-        path = str(path_obj)
-        name = path_obj.name
-        parent = str(path_obj.parent)
-        if path in self._directories:
+        parent = str(self.parent.resolve(strict=True))
+        name = self.name
+        path = self.parser.join(parent, name)
+        parent_node = self._get_node(parent, mutable=True)
+        node = self._get_node(path)
+        if node is not None and node.children is not None:
             raise IsADirectoryError(errno.EISDIR, "Is a directory", path)
-        elif path in self._files:
-            self._directories[parent].remove(name)
-            del self._files[path]
-        elif path in self._symlinks:
-            self._directories[parent].remove(name)
-            del self._symlinks[path]
+        elif node is not None:
+            del parent_node.children[name]
         elif not missing_ok:
             raise FileNotFoundError(errno.ENOENT, "File not found", path)
 
     def rmdir(self):
-        path_obj = self.parent.resolve(strict=True) / self.name
-        path = str(path_obj)
-        if path in self._files or path in self._symlinks:
-            raise NotADirectoryError(errno.ENOTDIR, "Not a directory", path)
-        elif path not in self._directories:
+        parent = str(self.parent.resolve(strict=True))
+        name = self.name
+        path = self.parser.join(parent, name)
+        node = self._get_node(path)
+        if node is None:
             raise FileNotFoundError(errno.ENOENT, "File not found", path)
-        elif self._directories[path]:
+        elif node.children is None:
+            raise NotADirectoryError(errno.ENOTDIR, "Not a directory", path)
+        elif node.children:
             raise OSError(errno.ENOTEMPTY, "Directory not empty", path)
         else:
-            name = path_obj.name
-            parent = str(path_obj.parent)
-            self._directories[parent].remove(name)
-            del self._directories[path]
+            parent_node = self._get_node(parent, mutable=True)
+            del parent_node.children[name]
 
 
 class DummyPathTest(DummyPurePathTest):
@@ -1575,13 +1619,32 @@ class DummyPathTest(DummyPurePathTest):
     #  `-- brokenLinkLoop -> brokenLinkLoop
     #
 
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        if issubclass(cls.cls, DummyPath):
+            # Build the in-memory hierarchy once and freeze it. Tests share
+            # it, and DummyPath copies directories only when they change.
+            cls.createTestHierarchy()
+            root = cls.cls._root
+            root.freeze()
+            cls._pristine_nodes = root.children
+            root.children = {}
+
     def setUp(self):
         super().setUp()
-        name = self.id().split('.')[-1]
-        if name in _tests_needing_symlinks and not self.can_symlink:
+        test_method = getattr(self, self._testMethodName)
+        if getattr(test_method, 'needs_symlinks', False) and not self.can_symlink:
             self.skipTest('requires symlinks')
-        parser = self.cls.parser
-        p = self.cls(self.base)
+        if issubclass(self.cls, DummyPath):
+            self.cls._root.children = self._pristine_nodes
+        else:
+            self.createTestHierarchy()
+
+    @classmethod
+    def createTestHierarchy(cls):
+        parser = cls.cls.parser
+        p = cls.cls(cls.base)
         p.mkdir(parents=True)
         p.joinpath('dirA').mkdir()
         p.joinpath('dirB').mkdir()
@@ -1598,7 +1661,7 @@ def setUp(self):
             f.write(b"this is a novel\n")
         with p.joinpath('dirC', 'dirD', 'fileD').open('wb') as f:
             f.write(b"this is file D\n")
-        if self.can_symlink:
+        if cls.can_symlink:
             p.joinpath('linkA').symlink_to('fileA')
             p.joinpath('brokenLink').symlink_to('non-existing')
             p.joinpath('linkB').symlink_to('dirB')
@@ -1607,10 +1670,7 @@ def setUp(self):
             p.joinpath('brokenLinkLoop').symlink_to('brokenLinkLoop')
 
     def tearDown(self):
-        cls = self.cls
-        cls._files.clear()
-        cls._directories.clear()
-        cls._symlinks.clear()
+        self.cls._root.children = {}
 
     def tempdir(self):
         path = self.cls(self.base).with_name('tmp-dirD')
@@ -2793,17 +2853,21 @@ class DummyPathWithSymlinks(DummyPath):
     _max_symlinks = 20
 
     def readlink(self):
-        path = str(self.parent.resolve() / self.name)
-        if path in self._symlinks:
-            return self.with_segments(self._symlinks[path])
-        elif path in self._files or path in self._directories:
+        path = self.parser.join(str(self.parent.resolve()), self.name)
+        node = self._get_node(path)
+        if node is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", path)
+        elif node.target is None:
             raise OSError(errno.EINVAL, "Not a symlink", path)
         else:
-            raise FileNotFoundError(errno.ENOENT, "File not found", path)
+            return self.with_segments(node.target)
 
     def symlink_to(self, target, target_is_directory=False):
-        self._directories[str(self.parent)].add(self.name)
-        self._symlinks[str(self)] = str(target)
+        parent = str(self.parent)
+        parent_node = self._get_node(parent, mutable=True)
+        if parent_node is None or parent_node.children is None:
+            raise FileNotFoundError(errno.ENOENT, "File not found", parent)
+        parent_node.children[self.name] = DummyPathNode(target=str(target))
 
 
 class DummyPathWithSymlinksTest(DummyPathTest):